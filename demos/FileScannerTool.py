@@ -1,9 +1,17 @@
 import asyncio
+import functools
+import hashlib
+import heapq
+import json
 import os
+import queue
 import sys
 import re
+import threading
+import time
+from collections import deque
 from pathlib import Path
-from typing import List
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 # ------------------------------------------------------------
 # Load env (tokens should live in your .env, NOT hardcoded)
@@ -30,43 +38,212 @@ from fairlib import (
 )
 
 
+# -----------------------------
+# Tool-input parsing helpers
+# -----------------------------
+# "path": "<value>" pair in JSON-ish tool input (group 2 is the value)
+_PATH_KV_RE = re.compile(r'"path"\s*:\s*([\'"])(.+?)\1')
+
+
+def _looks_like_win_drive_json(s: str) -> bool:
+    """
+    True if a quoted "path" key has a value starting with a Windows drive,
+    e.g. {"path": "C:\\...}. Plain string scanning; most inputs fail fast on find().
+    """
+    n = len(s)
+    i = s.find("path")
+    while i != -1:
+        j = i + 4
+        if i > 0 and s[i - 1] in "\"'" and j < n and s[j] in "\"'":
+            j += 1
+            while j < n and s[j].isspace():
+                j += 1
+            if j < n and s[j] == ":":
+                j += 1
+                while j < n and s[j].isspace():
+                    j += 1
+                if (j + 3 < n and s[j] in "\"'"
+                        and s[j + 1].isascii() and s[j + 1].isalpha()
+                        and s[j + 2] == ":" and s[j + 3] == "\\"):
+                    return True
+        i = s.find("path", i + 4)
+    return False
+
+
+def _esc_backslashes(m: re.Match) -> str:
+    """re.sub callback for _PATH_KV_RE: escape backslashes in the path value."""
+    quote = m.group(1)
+    body = m.group(2).replace("\\", "\\\\")
+    return f"\"path\":{quote}{body}{quote}"
+
+
+def _escape_path_value(s: str) -> Optional[str]:
+    """
+    Escape backslashes in the first "path" value by slicing it out and
+    splicing it back, without a regex. Every backslash in the value is doubled,
+    as _esc_backslashes does. Returns None if the "path": "<value>" pair can't
+    be located, so the caller can fall back to _PATH_KV_RE.
+    """
+    i = s.find('"path"')
+    if i == -1:
+        return None
+    n = len(s)
+    j = i + 6
+    while j < n and s[j].isspace():
+        j += 1
+    if j >= n or s[j] != ":":
+        return None
+    j += 1
+    while j < n and s[j].isspace():
+        j += 1
+    if j >= n or s[j] not in "\"'":
+        return None
+    end = s.find(s[j], j + 2)  # value is at least one character, as in _PATH_KV_RE
+    if end == -1:
+        return None
+    return s[:j + 1] + s[j + 1:end].replace("\\", "\\\\") + s[end:]
+
+
+# -----------------------------
+# Size formatting
+# -----------------------------
+_BYTES_PER_MB = 1 << 20
+
+
+def _to_mb(num_bytes: int) -> float:
+    """Bytes to MB, truncated to 2 decimals with integer math (no float divide + round)."""
+    return (num_bytes * 100 // _BYTES_PER_MB) / 100.0
+
+
+# -----------------------------
+# Result "reason" strings
+# -----------------------------
+# Shared across result dicts so large scans reuse one string object per reason
+_REASON_LARGE = sys.intern("Large file")
+_REASON_TEMP = sys.intern("Temporary file")
+
+
+@functools.lru_cache(maxsize=4096)
+def _old_file_reason(age_days: int) -> str:
+    return f"Not modified in {age_days} days"
+
+
+@functools.lru_cache(maxsize=256)
+def _duplicate_reason(group_size: int) -> str:
+    return f"Duplicate ({group_size} identical files)"
+
+
+# -----------------------------
+# Content hashing for duplicate detection
+# -----------------------------
+_SAMPLE_BYTES = 4096  # head/tail sample size for the cheap first-stage hash
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+def _hash_factory():
+    """Return a hash constructor: blake3 if installed, else hashlib.blake2b."""
+    try:
+        from blake3 import blake3
+        return blake3
+    except ImportError:
+        return hashlib.blake2b
+
+
+def _sample_digest(file_path: str, size: int, hasher) -> bytes:
+    """Hash the first and (for files over 8 KiB) last 4 KiB of a file."""
+    with open(file_path, "rb") as f:
+        h = hasher(f.read(_SAMPLE_BYTES))
+        if size > 2 * _SAMPLE_BYTES:
+            f.seek(-_SAMPLE_BYTES, os.SEEK_END)
+            h.update(f.read(_SAMPLE_BYTES))
+    return bytes(h.digest())
+
+
+def _full_digest(file_path: str, hasher) -> bytes:
+    """Hash a whole file in 1 MiB chunks, reusing a single read buffer."""
+    h = hasher()
+    buf = bytearray(_HASH_CHUNK_BYTES)
+    view = memoryview(buf)
+    with open(file_path, "rb") as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+    return bytes(h.digest())
+
+
+def _group_by_digest(files: List[str], digest) -> List[List[str]]:
+    """Split `files` by digest(file_path), keeping only groups of 2+. Unreadable files are dropped."""
+    groups: Dict[bytes, List[str]] = {}
+    for file_path in files:
+        try:
+            groups.setdefault(digest(file_path), []).append(file_path)
+        except (PermissionError, OSError):
+            continue
+    return [g for g in groups.values() if len(g) > 1]
+
+
+def _parse_bool(value, name: str) -> bool:
+    """Accept a real bool or the strings 'true'/'false' (any case); reject anything else."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    raise ValueError(f"'{name}' must be true or false, got {value!r}")
+
+
 # -----------------------------
 # Path resolution helper (NEW)
 # -----------------------------
-def _resolve_scan_path(raw_path: str) -> Path:
+@functools.lru_cache(maxsize=1)
+def _resolve_downloads_dir() -> Path:
+    """
+    Find the user's Downloads folder, trying OneDrive variants on Windows.
+    Memoized because it probes the filesystem; the caller clears the cache
+    when the returned directory turns out to be missing.
+    """
+    home = Path.home()
+    candidates = [
+        home / "Downloads",
+        home / "downloads",
+    ]
+    # Windows OneDrive variants
+    if os.name == "nt":
+        userprofile = os.environ.get("USERPROFILE", "")
+        if userprofile:
+            candidates += [
+                Path(userprofile) / "Downloads",
+                Path(userprofile) / "OneDrive" / "Downloads",
+            ]
+    for c in candidates:
+        if c.exists() and c.is_dir():
+            return c
+    # Fall back to expected location even if missing (caller will error nicely)
+    return home / "Downloads"
+
+
+def _resolve_scan_path(raw_path: str, resolve_symlinks: bool = False) -> Path:
     """
     Normalize user-provided paths:
     - Accept aliases like 'downloads', 'download', 'dl'
     - Expand ~ and %ENVVARS%
     - Try OneDrive/Downloads on Windows
+    - Make the path absolute lexically; only resolve symlinks if asked
+      (resolve() costs an lstat per path component)
     """
     if not raw_path:
         return Path.cwd()
 
     alias = raw_path.strip().strip('"').strip("'").lower()
     if alias in {"downloads", "download", "dl"}:
-        home = Path.home()
-        candidates = [
-            home / "Downloads",
-            home / "downloads",
-        ]
-        # Windows OneDrive variants
-        if os.name == "nt":
-            userprofile = os.environ.get("USERPROFILE", "")
-            if userprofile:
-                candidates += [
-                    Path(userprofile) / "Downloads",
-                    Path(userprofile) / "OneDrive" / "Downloads",
-                ]
-        for c in candidates:
-            if c.exists() and c.is_dir():
-                return c
-        # Fall back to expected location even if missing (caller will error nicely)
-        return home / "Downloads"
+        return _resolve_downloads_dir()
 
     # Expand ~ and env vars; allow forward slashes on Windows
     expanded = os.path.expanduser(os.path.expandvars(raw_path.strip('"').strip("'")))
-    return Path(expanded).resolve()
+    if resolve_symlinks:
+        return Path(expanded).resolve(strict=False)
+    return Path(os.path.abspath(expanded))
 
 
 class FileScannerTool(AbstractTool):
@@ -75,6 +252,17 @@ class FileScannerTool(AbstractTool):
     that might be candidates for deletion.
     """
 
+    SCAN_CATEGORIES = ("large_files", "temp_files", "old_files", "duplicates")
+    # Threads that list directories. 1 walks sequentially in a fixed order, which is
+    # as fast as threads on a warm cache; more threads overlap readdir/stat on a
+    # cold cache but return files in a different order each run.
+    WALK_WORKERS = 1
+    MAX_RESULTS_SHOWN = 20  # files returned to the agent per category
+    MAX_RESULTS = 1000      # scans stop collecting matches past this (truncated=True)
+
+    _TEMP_EXT = frozenset({'.tmp', '.temp', '.cache', '.log', '.bak', '~'})
+    _TEMP_NAME_RE = re.compile(r'(?:tmp|temp|cache|__pycache__)', re.IGNORECASE)
+
     def __init__(self):
         super().__init__()
         self.name = "file_scanner"
@@ -82,7 +270,9 @@ class FileScannerTool(AbstractTool):
             "Scans a directory and identifies files that may need deletion. "
             "Parameters: 'path' (directory to scan), 'min_size_mb' (minimum file size in MB), "
             "'extensions' (comma-separated list like '.tmp,.log'), "
-            "'scan_type' (options: 'large_files', 'temp_files', 'old_files', 'duplicates')"
+            "'scan_type' (options: 'large_files', 'temp_files', 'old_files', 'duplicates', "
+            "'all' (runs every scan in a single pass over the directory)), "
+            "'resolve_symlinks' (true/false, default false: resolve symlinks in 'path')"
         )
 
     def use(self, *args, **kwargs) -> str:
@@ -90,7 +280,6 @@ class FileScannerTool(AbstractTool):
         Scans directory based on specified criteria.
         Flexibly accepts arguments in multiple formats.
         """
-        import json
 
         # -------- helper: parse JSON that may have unescaped Windows backslashes --------
         def _try_parse_json_with_backslash_fix(s: str):
@@ -102,15 +291,12 @@ class FileScannerTool(AbstractTool):
                 return json.loads(s), None
             except json.JSONDecodeError as e1:
                 looks_json = s.strip().startswith("{") and ("\"path\"" in s or "'path'" in s)
-                has_win_drive = re.search(r'["\']path["\']\s*:\s*["\'][A-Za-z]:\\', s) is not None
+                has_win_drive = _looks_like_win_drive_json(s)
                 if looks_json and has_win_drive:
                     # Only target the value of "path": "..."
-                    def esc_backslashes(m):
-                        quote = m.group(1)
-                        body = m.group(2).replace("\\", "\\\\")
-                        return f"\"path\":{quote}{body}{quote}"
-
-                    s_fixed = re.sub(r'"path"\s*:\s*([\'"])(.+?)\1', esc_backslashes, s)
+                    s_fixed = _escape_path_value(s)
+                    if s_fixed is None:
+                        s_fixed = _PATH_KV_RE.sub(_esc_backslashes, s)
                     try:
                         return json.loads(s_fixed), "auto_escaped_backslashes"
                     except json.JSONDecodeError as e2:
@@ -130,6 +316,7 @@ class FileScannerTool(AbstractTool):
                 min_size_mb = float(parsed.get('min_size_mb', 10.0))
                 extensions = parsed.get('extensions', '')
                 scan_type = parsed.get('scan_type', 'large_files')
+                resolve_symlinks = parsed.get('resolve_symlinks', False)
             else:
                 # 2) Fallback: comma-separated inputs
                 #    Examples:
@@ -138,7 +325,7 @@ class FileScannerTool(AbstractTool):
                 parts = [p.strip() for p in tool_input.split(',')]
                 raw = parts[0] if parts else '.'
 
-                m = re.search(r'"path"\s*:\s*([\'"])(.+?)\1', raw)
+                m = _PATH_KV_RE.search(raw)
                 if m:
                     raw = m.group(2)
 
@@ -146,6 +333,7 @@ class FileScannerTool(AbstractTool):
                 extensions = parts[1] if len(parts) > 1 else ''
                 scan_type = parts[2] if len(parts) > 2 else 'large_files'
                 min_size_mb = 10.0
+                resolve_symlinks = False
 
         elif kwargs:
             # Direct keyword arguments
@@ -153,17 +341,19 @@ class FileScannerTool(AbstractTool):
             min_size_mb = float(kwargs.get('min_size_mb', 10.0))
             extensions = kwargs.get('extensions', '')
             scan_type = kwargs.get('scan_type', 'large_files')
+            resolve_symlinks = kwargs.get('resolve_symlinks', False)
         else:
             path = '.'
             min_size_mb = 10.0
             extensions = ''
             scan_type = 'large_files'
+            resolve_symlinks = False
 
         # -----------------------------
         # Resolve path & normalize
         # -----------------------------
         try:
-            scan_path = _resolve_scan_path(path)
+            scan_path = _resolve_scan_path(path, resolve_symlinks=_parse_bool(resolve_symlinks, "resolve_symlinks"))
 
             # Helpful hint for Windows JSON escaping
             hint = None
@@ -175,6 +365,8 @@ class FileScannerTool(AbstractTool):
                             "(e.g., C:\\\\Users\\\\Luke\\\\Downloads) or forward slashes (C:/Users/Luke/Downloads).")
 
             if not scan_path.exists():
+                # A cached Downloads lookup may be stale; probe again next time
+                _resolve_downloads_dir.cache_clear()
                 return json.dumps({
                     "error": f"Path '{path}' does not exist after expansion.",
                     "resolved_path": str(scan_path),
@@ -198,135 +390,348 @@ class FileScannerTool(AbstractTool):
                     ext_list.append(e)
             else:
                 ext_list = []
+            ext_set = frozenset(ext_list) if ext_list else None
 
             # Run selected scan
+            shown = self.MAX_RESULTS_SHOWN
             if scan_type == "large_files":
-                results, total_size = self._scan_large_files(scan_path, min_size_mb, ext_list)
+                results, total_size, files_found, truncated = self._scan_large_files(scan_path, min_size_mb, ext_set)
             elif scan_type == "temp_files":
-                results, total_size = self._scan_temp_files(scan_path)
+                results, total_size, files_found, truncated = self._scan_temp_files(scan_path)
             elif scan_type == "old_files":
-                results, total_size = self._scan_old_files(scan_path, days=180)
+                results, total_size, files_found, truncated = self._scan_old_files(scan_path, days=180)
             elif scan_type == "duplicates":
-                results, total_size = self._scan_duplicates(scan_path)
+                results, total_size, files_found, truncated = self._scan_duplicates(scan_path)
+            elif scan_type == "all":
+                results, total_size, files_found, truncated = self._scan_all(scan_path, min_size_mb, ext_set, days=180)
+                return json.dumps({
+                    "scan_type": scan_type,
+                    "path": str(scan_path),
+                    "files_found": files_found,
+                    "total_size_mb": {k: _to_mb(v) for k, v in total_size.items()},
+                    "truncated": truncated,
+                    "files": {k: v[:shown] for k, v in results.items()},
+                    "note": f"Limited to first {shown} files per category"
+                })
             else:
                 return json.dumps({"error": f"Unknown scan_type: {scan_type}"})
 
+            if truncated:
+                note = f"Scan stopped after {self.MAX_RESULTS} matches; first {shown} shown"
+            elif files_found > shown:
+                note = f"Limited to first {shown} files"
+            else:
+                note = "All files shown"
             return json.dumps({
                 "scan_type": scan_type,
                 "path": str(scan_path),
-                "files_found": len(results),
-                "total_size_mb": round(total_size / (1024 * 1024), 2),
-                "files": results[:20],  # Limit to 20 files for readability
-                "note": "Limited to first 20 files" if len(results) > 20 else "All files shown"
+                "files_found": files_found,
+                "total_size_mb": _to_mb(total_size),
+                "truncated": truncated,
+                "files": results[:shown],  # Limit for readability
+                "note": note
             })
 
         except Exception as e:
-            import json
             return json.dumps({"error": f"Scan failed: {str(e)}"})
 
-    def _scan_large_files(self, path: Path, min_size_mb: float, extensions: List[str]) -> tuple:
-        """Find files larger than specified size."""
-        results = []
-        total_size = 0
-        min_bytes = min_size_mb * 1024 * 1024
+    def _iter_files(self, root: Path):
+        """
+        Iteratively walk `root` with os.scandir, yielding DirEntry objects for
+        regular files. DirEntry caches is_file()/stat(), so each file costs far
+        fewer syscalls than rglob + is_file() + stat(). Symlinks are not followed.
+        Files whose stat() fails are skipped, so callers can use it freely.
+        With WALK_WORKERS > 1 the walk runs on worker threads instead.
+        """
+        if self.WALK_WORKERS > 1:
+            yield from self._iter_files_threaded(root, self.WALK_WORKERS)
+            return
+        pending = deque([os.fspath(root)])
+        while pending:
+            current = pending.popleft()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                entry.stat()  # cached for the caller
+                                yield entry
+                        except OSError:
+                            continue
+            except (PermissionError, OSError):
+                continue
+
+    def _iter_files_threaded(self, root: Path, workers: int):
+        """
+        _iter_files with `workers` long-lived threads draining a queue of
+        directories. readdir/stat release the GIL, so on a cold disk cache the
+        threads overlap their I/O latency. Each thread hands back one batch of
+        DirEntry objects (stat() already cached) per directory; batches arrive
+        in no fixed order.
+        """
+        dirs: queue.Queue[Optional[str]] = queue.Queue()
+        batches: queue.Queue[Optional[List[os.DirEntry]]] = queue.Queue()
+        stop = threading.Event()
 
-        for file_path in path.rglob("*"):
-            if file_path.is_file():
+        def drain_dirs():
+            while True:
+                current = dirs.get()
                 try:
-                    size = file_path.stat().st_size
-                    if size >= min_bytes:
-                        if not extensions or file_path.suffix.lower() in extensions:
-                            results.append({
-                                "path": str(file_path.relative_to(path)),
-                                "size_mb": round(size / (1024 * 1024), 2),
-                                "reason": "Large file"
-                            })
-                            total_size += size
-                except (PermissionError, OSError):
-                    continue
-
-        results.sort(key=lambda x: x["size_mb"], reverse=True)
-        return results, total_size
+                    if current is None:
+                        return
+                    if stop.is_set():
+                        continue
+                    files = []
+                    try:
+                        with os.scandir(current) as it:
+                            for entry in it:
+                                try:
+                                    if entry.is_dir(follow_symlinks=False):
+                                        dirs.put(entry.path)
+                                    elif entry.is_file(follow_symlinks=False):
+                                        entry.stat()
+                                        files.append(entry)
+                                except OSError:
+                                    continue
+                    except (PermissionError, OSError):
+                        pass
+                    if files:
+                        batches.put(files)
+                finally:
+                    dirs.task_done()
+
+        def signal_done():
+            dirs.join()  # every queued directory has been listed
+            batches.put(None)
+
+        dirs.put(os.fspath(root))
+        threads = [threading.Thread(target=drain_dirs, daemon=True) for _ in range(workers)]
+        threads.append(threading.Thread(target=signal_done, daemon=True))
+        for t in threads:
+            t.start()
+        try:
+            while True:
+                files = batches.get()
+                if files is None:
+                    break
+                yield from files
+        finally:
+            # Also runs when the caller stops early: skip remaining directories
+            stop.set()
+            for _ in range(workers):
+                dirs.put(None)
+            for t in threads[:workers]:
+                t.join()
+            # Directories queued after the sentinels; settle them so signal_done exits
+            while True:
+                try:
+                    dirs.get_nowait()
+                except queue.Empty:
+                    break
+                dirs.task_done()
+
+    def _scan_large_files(self, path: Path, min_size_mb: float, extensions: Optional[FrozenSet[str]]) -> tuple:
+        """
+        Find files larger than specified size, optionally limited to a set of
+        extensions (None = any). Every match is counted, but only the largest
+        MAX_RESULTS_SHOWN are kept, via a bounded min-heap.
+        """
+        top: List[Tuple[int, str]] = []  # min-heap of (size, rel_path)
+        # Walker paths are "<root><sep><rel>", so slice instead of relpath()
+        prefix_len = len(str(path).rstrip(os.sep)) + 1
+        files_found = 0
+        total_size = 0
+        min_bytes = min_size_mb * _BYTES_PER_MB
+
+        for entry in self._iter_files(path):
+            size = entry.stat().st_size
+            if size >= min_bytes:
+                if extensions is None or os.path.splitext(entry.name)[1].lower() in extensions:
+                    files_found += 1
+                    total_size += size
+                    self._push_top(top, size, entry.path[prefix_len:])
+
+        return self._large_file_results(top), total_size, files_found, False
+
+    def _push_top(self, heap: List[Tuple[int, str]], size: int, rel_path: str) -> None:
+        """Keep `heap` as the MAX_RESULTS_SHOWN largest (size, rel_path) pairs seen."""
+        if len(heap) < self.MAX_RESULTS_SHOWN:
+            heapq.heappush(heap, (size, rel_path))
+        elif size > heap[0][0]:
+            heapq.heappushpop(heap, (size, rel_path))
+
+    def _large_file_results(self, heap: List[Tuple[int, str]]) -> List[dict]:
+        """Turn a _push_top heap into result dicts, largest first."""
+        return [
+            {
+                "path": rel_path,
+                "size_mb": _to_mb(size),
+                "reason": _REASON_LARGE
+            }
+            for size, rel_path in sorted(heap, reverse=True)
+        ]
 
     def _scan_temp_files(self, path: Path) -> tuple:
-        """Find temporary files."""
-        temp_extensions = ['.tmp', '.temp', '.cache', '.log', '.bak', '~']
-        temp_patterns = ['tmp', 'temp', 'cache', '__pycache__']
-        results = []
+        """Find temporary files (stops after MAX_RESULTS matches)."""
+        results: List[dict] = []
+        prefix_len = len(str(path).rstrip(os.sep)) + 1
         total_size = 0
 
-        for file_path in path.rglob("*"):
-            if file_path.is_file():
-                try:
-                    is_temp = (
-                        file_path.suffix.lower() in temp_extensions or
-                        any(pattern in file_path.name.lower() for pattern in temp_patterns)
-                    )
-                    if is_temp:
-                        size = file_path.stat().st_size
-                        results.append({
-                            "path": str(file_path.relative_to(path)),
-                            "size_mb": round(size / (1024 * 1024), 2),
-                            "reason": "Temporary file"
-                        })
-                        total_size += size
-                except (PermissionError, OSError):
-                    continue
-
-        return results, total_size
+        for entry in self._iter_files(path):
+            is_temp = (
+                os.path.splitext(entry.name)[1].lower() in self._TEMP_EXT or
+                self._TEMP_NAME_RE.search(entry.name) is not None
+            )
+            if is_temp:
+                if len(results) >= self.MAX_RESULTS:
+                    return results, total_size, len(results), True
+                size = entry.stat().st_size
+                results.append({
+                    "path": entry.path[prefix_len:],
+                    "size_mb": _to_mb(size),
+                    "reason": _REASON_TEMP
+                })
+                total_size += size
+
+        return results, total_size, len(results), False
 
     def _scan_old_files(self, path: Path, days: int = 180) -> tuple:
-        """Find files not modified in specified days."""
-        import time
-        results = []
+        """Find files not modified in specified days (stops after MAX_RESULTS matches)."""
+        results: List[dict] = []
+        prefix_len = len(str(path).rstrip(os.sep)) + 1
         total_size = 0
-        cutoff_time = time.time() - (days * 24 * 60 * 60)
+        now = time.time()
+        cutoff_time = now - (days * 24 * 60 * 60)
+
+        for entry in self._iter_files(path):
+            st = entry.stat()
+            mtime = st.st_mtime
+            if mtime < cutoff_time:
+                if len(results) >= self.MAX_RESULTS:
+                    return results, total_size, len(results), True
+                size = st.st_size
+                age_days = int((now - mtime) * (1.0 / 86400.0))
+                results.append({
+                    "path": entry.path[prefix_len:],
+                    "size_mb": _to_mb(size),
+                    "reason": _old_file_reason(age_days)
+                })
+                total_size += size
 
-        for file_path in path.rglob("*"):
-            if file_path.is_file():
-                try:
-                    mtime = file_path.stat().st_mtime
-                    if mtime < cutoff_time:
-                        size = file_path.stat().st_size
-                        age_days = int((time.time() - mtime) / (24 * 60 * 60))
-                        results.append({
-                            "path": str(file_path.relative_to(path)),
-                            "size_mb": round(size / (1024 * 1024), 2),
-                            "reason": f"Not modified in {age_days} days"
-                        })
-                        total_size += size
-                except (PermissionError, OSError):
-                    continue
-
-        return results, total_size
+        return results, total_size, len(results), False
 
     def _scan_duplicates(self, path: Path) -> tuple:
-        """Find potential duplicate files based on size and name similarity."""
-        size_groups = {}
-        results = []
-        total_size = 0
+        """Find duplicate files: group by size, then confirm by content hash."""
+        size_groups: Dict[int, List[str]] = {}
 
         # Group files by size
-        for file_path in path.rglob("*"):
-            if file_path.is_file():
-                try:
-                    size = file_path.stat().st_size
-                    size_groups.setdefault(size, []).append(file_path)
-                except (PermissionError, OSError):
-                    continue
-
-        # Check files with same size for potential duplicates
-        for size, files in size_groups.items():
-            if len(files) > 1 and size > 0:
-                for file_path in files[1:]:  # Keep first, mark others
+        for entry in self._iter_files(path):
+            size_groups.setdefault(entry.stat().st_size, []).append(entry.path)
+
+        return self._duplicates_from_size_groups(path, size_groups)
+
+    def _duplicates_from_size_groups(self, path: Path, size_groups: dict) -> tuple:
+        """
+        Confirm same-size candidates by content. Files are first split by a
+        head/tail sample hash; only collisions that survive get a full-file hash.
+        Files up to 4 KiB are fully covered by the sample, so one stage suffices.
+        Largest sizes are checked first; hashing stops after MAX_RESULTS duplicates.
+        """
+        results: List[dict] = []
+        prefix_len = len(str(path).rstrip(os.sep)) + 1
+        total_size = 0
+        hasher = _hash_factory()
+
+        for size, files in sorted(size_groups.items(), reverse=True):
+            if len(files) < 2 or size == 0:
+                continue
+
+            groups = _group_by_digest(files, lambda fp: _sample_digest(fp, size, hasher))
+            if size > _SAMPLE_BYTES:
+                groups = [
+                    confirmed
+                    for group in groups
+                    for confirmed in _group_by_digest(group, lambda fp: _full_digest(fp, hasher))
+                ]
+
+            for group in groups:
+                group.sort()  # order varies with WALK_WORKERS > 1; keep the same "original"
+                reason = _duplicate_reason(len(group))
+                for file_path in group[1:]:  # Keep first, mark others
+                    if len(results) >= self.MAX_RESULTS:
+                        return results, total_size, len(results), True
                     results.append({
-                        "path": str(file_path.relative_to(path)),
-                        "size_mb": round(size / (1024 * 1024), 2),
-                        "reason": f"Potential duplicate ({len(files)} files with same size)"
+                        "path": file_path[prefix_len:],
+                        "size_mb": _to_mb(size),
+                        "reason": reason
                     })
                     total_size += size
 
-        return results, total_size
+        return results, total_size, len(results), False
+
+    def _scan_all(self, path: Path, min_size_mb: float, extensions: Optional[FrozenSet[str]], days: int = 180) -> tuple:
+        """
+        Run every scan category in one traversal. Each file is stat'ed once and
+        classified into the large/temp/old/duplicate buckets.
+        Returns (results, total_size, files_found, truncated), all dicts keyed by category.
+        """
+        results: Dict[str, List[dict]] = {category: [] for category in self.SCAN_CATEGORIES}
+        prefix_len = len(str(path).rstrip(os.sep)) + 1
+        total_size = dict.fromkeys(self.SCAN_CATEGORIES, 0)
+        files_found = dict.fromkeys(self.SCAN_CATEGORIES, 0)
+        truncated = dict.fromkeys(self.SCAN_CATEGORIES, False)
+        largest: List[Tuple[int, str]] = []  # _push_top heap
+        min_bytes = min_size_mb * _BYTES_PER_MB
+        now = time.time()
+        cutoff_time = now - (days * 24 * 60 * 60)
+        size_groups: Dict[int, List[str]] = {}
+
+        for entry in self._iter_files(path):
+            st = entry.stat()
+            size = st.st_size
+            mtime = st.st_mtime
+            name = entry.name
+            ext = os.path.splitext(name)[1].lower()
+
+            if size >= min_bytes and (extensions is None or ext in extensions):
+                files_found["large_files"] += 1
+                total_size["large_files"] += size
+                self._push_top(largest, size, entry.path[prefix_len:])
+
+            # Temp/old buckets stop collecting once full; the walk continues for the others
+            if not truncated["temp_files"] and (ext in self._TEMP_EXT or self._TEMP_NAME_RE.search(name)):
+                if len(results["temp_files"]) >= self.MAX_RESULTS:
+                    truncated["temp_files"] = True
+                else:
+                    results["temp_files"].append({
+                        "path": entry.path[prefix_len:],
+                        "size_mb": _to_mb(size),
+                        "reason": _REASON_TEMP
+                    })
+                    total_size["temp_files"] += size
+
+            if not truncated["old_files"] and mtime < cutoff_time:
+                if len(results["old_files"]) >= self.MAX_RESULTS:
+                    truncated["old_files"] = True
+                else:
+                    age_days = int((now - mtime) * (1.0 / 86400.0))
+                    results["old_files"].append({
+                        "path": entry.path[prefix_len:],
+                        "size_mb": _to_mb(size),
+                        "reason": _old_file_reason(age_days)
+                    })
+                    total_size["old_files"] += size
+
+            size_groups.setdefault(size, []).append(entry.path)
+
+        results["large_files"] = self._large_file_results(largest)
+        files_found["temp_files"] = len(results["temp_files"])
+        files_found["old_files"] = len(results["old_files"])
+        (results["duplicates"], total_size["duplicates"],
+         files_found["duplicates"], truncated["duplicates"]) = self._duplicates_from_size_groups(path, size_groups)
+        return results, total_size, files_found, truncated
 
 
 async def main():
@@ -388,6 +793,7 @@ async def main():
     print("  - 'Find all temporary files in downloads'")
     print("  - 'Look for old files not modified in 6 months'")
     print("  - 'Check for duplicate files'")
+    print("  - 'Run a full cleanup scan of downloads'")
     print("\nType 'exit' to quit.\n")
 
     # Quick sanity check (NEW): show what 'downloads' resolves to